@@ -1,13 +1,43 @@
+from typing import Optional
+
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
 
 
 class Settings(BaseSettings):
-    DB_USER: str
-    DB_PASSWORD: str
-    DB_HOST: str
-    DB_NAME: str
+    # DB_URL 이 없으면 MySQL 설정 4개 모두 필수
+    DB_USER: Optional[str] = None
+    DB_PASSWORD: Optional[str] = None
+    DB_HOST: Optional[str] = None
+    DB_NAME: Optional[str] = None
     DB_PORT: int = 3306
 
+    # 지정 시 위 MySQL 설정 대신 사용 (예: 벤치마크용 sqlite:///bench.db)
+    DB_URL: Optional[str] = None
+
+    # 카테고리별 모델 폴더 (기본: 프로젝트 루트의 models/)
+    MODELS_DIR: Optional[str] = None
+
+    # 예측 결과 캐시 (DIR 지정 시 디스크에도 저장)
+    PREDICT_CACHE_SIZE: int = 256
+    PREDICT_CACHE_DIR: Optional[str] = None
+    PREDICT_CACHE_DISK_MAX: int = 10000
+
+    # 이 시간(ms) 이상 걸린 요청은 로그로 남김
+    SLOW_REQUEST_MS: Optional[float] = None
+
+    @model_validator(mode="after")
+    def _check_db(self):
+        if self.DB_URL:
+            return self
+        missing = [
+            k for k in ("DB_USER", "DB_PASSWORD", "DB_HOST", "DB_NAME")
+            if getattr(self, k) is None
+        ]
+        if missing:
+            raise ValueError(f"DB_URL or {', '.join(missing)} must be set (backend/.env)")
+        return self
+
     class Config:
         env_file = "backend/.env"
 
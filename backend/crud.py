@@ -1,8 +1,12 @@
 from typing import List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from backend import models
 
 
+def get_category_by_id(db: Session, category_id: int) -> Optional[models.Category]:
+    return db.query(models.Category).filter(models.Category.id == category_id).first()
+
+
 def get_categories(db: Session) -> List[models.Category]:
     return db.query(models.Category).order_by(models.Category.id).all()
 
@@ -17,3 +21,25 @@ def get_products(db: Session) -> List[models.Product]:
 
 def get_product_by_id(db: Session, product_id: int) -> Optional[models.Product]:
     return db.query(models.Product).filter(models.Product.id == product_id).first()
+
+
+def get_products_detail_by_ids(db: Session, product_ids: List[int]) -> List[models.Product]:
+    # 관계까지 한 번에 (id 개수와 관계없이 쿼리 수 고정)
+    return (
+        db.query(models.Product)
+        .options(
+            selectinload(models.Product.category),
+            selectinload(models.Product.sweeteners).selectinload(models.ProductSweetener.sweetener),
+            selectinload(models.Product.nutrition),
+        )
+        .filter(models.Product.id.in_(product_ids))
+        .all()
+    )
+
+
+def get_product_by_name(db: Session, name: str, category_id: int) -> Optional[models.Product]:
+    return (
+        db.query(models.Product)
+        .filter(models.Product.name == name, models.Product.category_id == category_id)
+        .first()
+    )
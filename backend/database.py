@@ -2,12 +2,15 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from backend.config import settings
 
-url = (
+url = settings.DB_URL or (
     f"mysql+pymysql://{settings.DB_USER}:{settings.DB_PASSWORD}"
     f"@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}?charset=utf8mb4"
 )
 
-engine = create_engine(url, echo=False, pool_pre_ping=True)
+# sqlite 는 스레드풀에서 같은 연결을 쓸 수 있도록
+connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
+
+engine = create_engine(url, echo=False, pool_pre_ping=True, connect_args=connect_args)
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
 Base = declarative_base()
 
@@ -6,7 +6,10 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 
-from backend.routers import products, categories, sweeteners, predict
+from backend.config import settings
+from backend.database import engine
+from backend.metrics import MetricsMiddleware, instrument_engine
+from backend.routers import products, categories, sweeteners, predict, metrics
 
 app = FastAPI(
     title="Zero Side Effect API",
@@ -35,11 +38,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 요청 시간 / DB 쿼리 계측
+app.add_middleware(MetricsMiddleware, slow_request_ms=settings.SLOW_REQUEST_MS)
+instrument_engine(engine)
+
 # 라우터 등록
 app.include_router(products.router)
 app.include_router(categories.router)
 app.include_router(sweeteners.router)
 app.include_router(predict.router)
+app.include_router(metrics.router)
 
 
 # 메인 페이지: index.html 반환
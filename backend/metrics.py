@@ -0,0 +1,218 @@
+# 요청/DB/추론 계측 + Prometheus 텍스트 포맷 출력
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from starlette.middleware.base import BaseHTTPMiddleware
+
+logger = logging.getLogger("backend.metrics")
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _label_str(labels: Tuple[Tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    parts = []
+    for k, v in labels:
+        v = str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        parts.append(f'{k}="{v}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def _fmt(v: float) -> str:
+    if v == float("inf"):
+        return "+Inf"
+    return repr(float(v))
+
+
+class Counter:
+    def __init__(self, name: str, help_: str):
+        self.name = name
+        self.help = help_
+        self._values: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, v in sorted(self._values.items()):
+                lines.append(f"{self.name}{_label_str(key)} {_fmt(v)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help_: str, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_
+        self.buckets = tuple(buckets) + (float("inf"),)
+        # 라벨별 [버킷 카운트..., 합계, 개수]
+        self._values: Dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            row = self._values.get(key)
+            if row is None:
+                row = [0] * len(self.buckets) + [0.0, 0]
+                self._values[key] = row
+            for i, b in enumerate(self.buckets):
+                if value <= b:
+                    row[i] += 1
+            row[-2] += value
+            row[-1] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, row in sorted(self._values.items()):
+                for i, b in enumerate(self.buckets):
+                    lk = key + (("le", _fmt(b)),)
+                    lines.append(f"{self.name}_bucket{_label_str(lk)} {row[i]}")
+                lines.append(f"{self.name}_sum{_label_str(key)} {_fmt(row[-2])}")
+                lines.append(f"{self.name}_count{_label_str(key)} {row[-1]}")
+        return lines
+
+
+# 지표 정의
+REQUEST_LATENCY = Histogram(
+    "zse_http_request_duration_seconds", "HTTP request latency by route"
+)
+REQUEST_QUERIES = Histogram(
+    "zse_http_request_db_queries", "DB queries per HTTP request",
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200, 500),
+)
+REQUEST_DB_TIME = Histogram(
+    "zse_http_request_db_seconds", "DB time per HTTP request"
+)
+DB_QUERIES = Counter("zse_db_queries_total", "Total DB queries")
+DB_TIME = Counter("zse_db_seconds_total", "Total DB time in seconds")
+STAGE_LATENCY = Histogram(
+    "zse_stage_duration_seconds", "Latency of named stages inside a request"
+)
+
+_ALL = [REQUEST_LATENCY, REQUEST_QUERIES, REQUEST_DB_TIME, DB_QUERIES, DB_TIME, STAGE_LATENCY]
+
+# 추가 지표 (name, type, help, labels, value) 를 돌려주는 함수들
+# type 은 "gauge" 또는 "counter" (counter 는 이름이 _total 로 끝나야 함)
+_collectors: List[Callable[[], List[Tuple[str, str, str, dict, float]]]] = []
+
+
+def register_collector(fn: Callable[[], List[Tuple[str, str, str, dict, float]]]):
+    _collectors.append(fn)
+    return fn
+
+
+# 요청 단위 상태 (하위 태스크/스레드에서도 같은 dict 를 공유)
+class _RequestStats:
+    __slots__ = ("queries", "db_time", "stages")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.stages: Dict[str, float] = {}
+
+
+_current: ContextVar[Optional[_RequestStats]] = ContextVar("zse_request_stats", default=None)
+
+
+@contextmanager
+def stage(route: str, name: str):
+    # 구간 타이머: with metrics.stage("/predict", "forward"):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_LATENCY.observe(elapsed, route=route, stage=name)
+        stats = _current.get()
+        if stats is not None:
+            stats.stages[name] = stats.stages.get(name, 0.0) + elapsed
+
+
+def instrument_engine(engine):
+    # SQLAlchemy 쿼리 수 / 시간
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("zse_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("zse_query_start")
+        if not starts:
+            return
+        elapsed = time.perf_counter() - starts.pop()
+        DB_QUERIES.inc()
+        DB_TIME.inc(elapsed)
+        stats = _current.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_time += elapsed
+
+
+def _route_label(request) -> str:
+    # 경로 파라미터 대신 라우트 템플릿 사용 (/products/{product_id}/full)
+    route = request.scope.get("route")
+    path = getattr(route, "path", None)
+    return path or "unmatched"
+
+
+class MetricsMiddleware(BaseHTTPMiddleware):
+    def __init__(self, app, slow_request_ms: Optional[float] = None):
+        super().__init__(app)
+        self.slow_request_ms = slow_request_ms
+
+    async def dispatch(self, request, call_next):
+        stats = _RequestStats()
+        token = _current.set(stats)
+        start = time.perf_counter()
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            elapsed = time.perf_counter() - start
+            _current.reset(token)
+
+            route = _route_label(request)
+            method = request.method
+            REQUEST_LATENCY.observe(elapsed, method=method, route=route, status=str(status))
+            REQUEST_QUERIES.observe(stats.queries, method=method, route=route)
+            REQUEST_DB_TIME.observe(stats.db_time, method=method, route=route)
+
+            if self.slow_request_ms is not None and elapsed * 1000 >= self.slow_request_ms:
+                stages = ", ".join(f"{k}={v * 1000:.1f}ms" for k, v in stats.stages.items())
+                logger.warning(
+                    "slow request %s %s %d %.1fms queries=%d db=%.1fms stages=[%s]",
+                    method, request.url.path, status, elapsed * 1000,
+                    stats.queries, stats.db_time * 1000, stages,
+                )
+
+
+def render() -> str:
+    lines = []
+    for m in _ALL:
+        lines.extend(m.render())
+
+    seen = set()
+    for fn in _collectors:
+        for name, type_, help_, labels, value in fn():
+            if name not in seen:
+                lines.append(f"# HELP {name} {help_}")
+                lines.append(f"# TYPE {name} {type_}")
+                seen.add(name)
+            lines.append(f"{name}{_label_str(tuple(sorted(labels.items())))} {_fmt(value)}")
+
+    return "\n".join(lines) + "\n"
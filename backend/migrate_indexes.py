@@ -0,0 +1,95 @@
+import argparse
+
+from sqlalchemy import inspect, text
+
+from backend import models
+from backend.database import engine
+
+# 기존 DB 에 카탈로그 인덱스 / 유니크 제약 추가 (여러 번 실행해도 안전)
+#   python -m backend.migrate_indexes --dry-run   # 중복 목록 / 만들 인덱스만 출력
+#   python -m backend.migrate_indexes
+
+tables = [models.Product.__table__, models.ProductSweetener.__table__]
+
+
+def find_duplicates(conn):
+    # (product_id, sweetener_id) 가 겹치는 행들, 쌍별로 id 순
+    rows = conn.execute(text(
+        "select ps.id, ps.product_id, ps.sweetener_id,"
+        " ps.amount_per_serving_mg, ps.amount_per_100ml_mg"
+        " from product_sweeteners ps"
+        " join ("
+        "  select product_id, sweetener_id from product_sweeteners"
+        "  group by product_id, sweetener_id having count(*) > 1"
+        " ) d on d.product_id = ps.product_id and d.sweetener_id = ps.sweetener_id"
+        " order by ps.product_id, ps.sweetener_id, ps.id"
+    )).fetchall()
+
+    pairs = {}
+    for r in rows:
+        pairs.setdefault((r.product_id, r.sweetener_id), []).append(r)
+    return pairs
+
+
+def print_duplicates(pairs):
+    # 가장 먼저 들어온 행(min id)을 남기고 나머지 삭제 대상
+    for (pid, sid), rows in pairs.items():
+        amounts = {(r.amount_per_serving_mg, r.amount_per_100ml_mg) for r in rows}
+        note = " (amounts differ!)" if len(amounts) > 1 else ""
+        print(f"product_id={pid} sweetener_id={sid}{note}")
+        for i, r in enumerate(rows):
+            action = "keep  " if i == 0 else "delete"
+            print(
+                f"  {action} id={r.id} serving_mg={r.amount_per_serving_mg}"
+                f" per100ml_mg={r.amount_per_100ml_mg}"
+            )
+
+
+def missing_indexes(conn):
+    insp = inspect(conn)
+    out = []
+    for table in tables:
+        existing = {ix["name"] for ix in insp.get_indexes(table.name)}
+        out.extend(ix for ix in table.indexes if ix.name not in existing)
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--dry-run", action="store_true", help="변경 없이 중복 행 / 추가할 인덱스만 출력")
+    ap.add_argument("--force", action="store_true", help="함량이 다른 중복도 min(id) 행만 남기고 삭제")
+    args = ap.parse_args()
+
+    with engine.begin() as conn:
+        pairs = find_duplicates(conn)
+        print("duplicate product_sweeteners pairs:", len(pairs))
+        print_duplicates(pairs)
+
+        todo = missing_indexes(conn)
+
+        if args.dry_run:
+            print("indexes to create:", [ix.name for ix in todo])
+            print("dry run, nothing changed")
+            return
+
+        conflicts = [
+            k for k, rows in pairs.items()
+            if len({(r.amount_per_serving_mg, r.amount_per_100ml_mg) for r in rows}) > 1
+        ]
+        if conflicts and not args.force:
+            print(f"{len(conflicts)} pairs have different amounts, fix them or rerun with --force")
+            raise SystemExit(1)
+
+        delete_ids = [r.id for rows in pairs.values() for r in rows[1:]]
+        if delete_ids:
+            ps = models.ProductSweetener.__table__
+            conn.execute(ps.delete().where(ps.c.id.in_(delete_ids)))
+        print("deleted product_sweeteners ids:", delete_ids)
+
+        for ix in todo:
+            ix.create(conn)
+        print("created:", [ix.name for ix in todo])
+
+
+if __name__ == "__main__":
+    main()
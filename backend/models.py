@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -31,6 +31,13 @@ class Product(Base):
     sweeteners = relationship("ProductSweetener", back_populates="product")
     nutrition = relationship("NutritionFacts", back_populates="product", uselist=False)
 
+    __table_args__ = (
+        # 이름순 목록 + 예측 결과 조회 (name, category_id)
+        Index("ix_products_name_category_id", "name", "category_id"),
+        # 카테고리별 이름순 목록
+        Index("ix_products_category_id_name", "category_id", "name"),
+    )
+
 
 class Sweetener(Base):
     __tablename__ = "sweeteners"
@@ -56,6 +63,13 @@ class ProductSweetener(Base):
     product = relationship("Product", back_populates="sweeteners")
     sweetener = relationship("Sweetener", back_populates="products")
 
+    __table_args__ = (
+        # 제품-대체당 쌍은 하나만 (product_id 조회도 이 인덱스 사용)
+        Index("uq_product_sweeteners_product_sweetener", "product_id", "sweetener_id", unique=True),
+        # 대체당 기준 필터링
+        Index("ix_product_sweeteners_sweetener_product", "sweetener_id", "product_id"),
+    )
+
 
 class NutritionFacts(Base):
     __tablename__ = "nutrition_facts"
@@ -0,0 +1,188 @@
+# 예측 결과 캐시 (이미지 해시 + 카테고리 + 모델 버전)
+
+import hashlib
+import json
+import shutil
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Optional
+
+
+def make_key(image_bytes: bytes, category_id: int, model_version: str) -> str:
+    # 같은 사진 + 같은 모델이면 같은 키
+    h = hashlib.sha256()
+    h.update(image_bytes)
+    h.update(f"|{category_id}|{model_version}".encode("utf-8"))
+    return h.hexdigest()
+
+
+def _version_dir(model_version: str) -> str:
+    return hashlib.sha1(model_version.encode("utf-8")).hexdigest()[:16]
+
+
+class PredictionCache:
+    # 디스크 구조: disk_dir/<category_id>/<버전 해시>/<key>.json
+    def __init__(self, max_size: int = 256, disk_dir: Optional[str] = None, disk_max_entries: int = 10000):
+        self.max_size = max_size
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.disk_max_entries = disk_max_entries
+
+        # key -> (category_id, 버전, 값)
+        self._items = OrderedDict()
+        # category_id -> 마지막으로 본 모델 버전
+        self._versions = {}
+        self._lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+        self._disk_count = 0
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if self.disk_dir:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+            self._disk_count = sum(1 for _ in self.disk_dir.glob("*/*/*.json"))
+
+    def get(self, key: str, category_id: int, model_version: str) -> Optional[List[str]]:
+        self._check_version(category_id, model_version)
+
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key][2]
+
+        value = self._read_disk(key, category_id, model_version)
+
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._put_memory(key, category_id, model_version, value)
+            return value
+
+    def set(self, key: str, value: List[str], category_id: int, model_version: str):
+        self._check_version(category_id, model_version)
+        with self._lock:
+            self._put_memory(key, category_id, model_version, value)
+        self._write_disk(key, category_id, model_version, value)
+
+    def clear(self):
+        # 메모리 + 디스크 항목 모두 삭제 (조회 횟수는 누적 유지)
+        with self._lock:
+            self._items.clear()
+            self._versions.clear()
+        if self.disk_dir:
+            with self._disk_lock:
+                for d in self.disk_dir.iterdir():
+                    if d.is_dir():
+                        shutil.rmtree(d, ignore_errors=True)
+                self._disk_count = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.disk_hits + self.misses
+            return {
+                "size": len(self._items),
+                "max_size": self.max_size,
+                "disk": str(self.disk_dir) if self.disk_dir else None,
+                "disk_entries": self._disk_count,
+                "disk_max_entries": self.disk_max_entries if self.disk_dir else None,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.disk_hits) / total if total else 0.0,
+            }
+
+    def _check_version(self, category_id, model_version):
+        # 모델 파일이 바뀌면 이전 버전 항목 정리
+        with self._lock:
+            old = self._versions.get(category_id)
+            if old == model_version:
+                return
+            self._versions[category_id] = model_version
+            if old is None:
+                stale = []
+            else:
+                stale = [k for k, v in self._items.items() if v[0] == category_id and v[1] != model_version]
+            for k in stale:
+                del self._items[k]
+
+        self._prune_disk_versions(category_id, model_version)
+
+    def _put_memory(self, key, category_id, model_version, value):
+        if self.max_size <= 0:
+            return
+        self._items[key] = (category_id, model_version, value)
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    # 디스크 저장 (선택)
+    def _disk_path(self, key, category_id, model_version):
+        return self.disk_dir / str(category_id) / _version_dir(model_version) / f"{key}.json"
+
+    def _read_disk(self, key, category_id, model_version):
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key, category_id, model_version)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_disk(self, key, category_id, model_version, value):
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key, category_id, model_version)
+        tmp = path.with_suffix(".tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            existed = path.exists()
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(value, f, ensure_ascii=False)
+            tmp.replace(path)
+        except OSError:
+            return
+
+        with self._disk_lock:
+            if not existed:
+                self._disk_count += 1
+            if self._disk_count > self.disk_max_entries:
+                self._prune_disk_oldest()
+
+    def _prune_disk_versions(self, category_id, model_version):
+        if not self.disk_dir:
+            return
+        cat_dir = self.disk_dir / str(category_id)
+        if not cat_dir.is_dir():
+            return
+        keep = _version_dir(model_version)
+        with self._disk_lock:
+            for d in cat_dir.iterdir():
+                if d.is_dir() and d.name != keep:
+                    self._disk_count -= sum(1 for _ in d.glob("*.json"))
+                    shutil.rmtree(d, ignore_errors=True)
+            self._disk_count = max(self._disk_count, 0)
+
+    def _prune_disk_oldest(self):
+        # 개수 상한을 넘으면 오래된 파일부터 90% 까지 삭제 (_disk_lock 안에서 호출)
+        files = []
+        for p in self.disk_dir.glob("*/*/*.json"):
+            try:
+                files.append((p.stat().st_mtime, p))
+            except OSError:
+                pass
+        files.sort()
+
+        target = int(self.disk_max_entries * 0.9)
+        remove = max(len(files) - target, 0)
+        for _, p in files[:remove]:
+            try:
+                p.unlink()
+            except OSError:
+                pass
+        self._disk_count = len(files) - remove
@@ -0,0 +1,14 @@
+# Prometheus 지표
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from backend import metrics
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("", response_class=PlainTextResponse, include_in_schema=False)
+def export_metrics():
+    # Prometheus 텍스트 포맷
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
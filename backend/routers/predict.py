@@ -3,7 +3,9 @@
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends
 from sqlalchemy.orm import Session
 from backend.database import get_db
-from backend import models
+from backend.config import settings
+from backend.predict_cache import PredictionCache, make_key
+from backend import crud, metrics
 
 from pathlib import Path
 from io import BytesIO
@@ -17,25 +19,57 @@ router = APIRouter(prefix="/predict", tags=["predict"])
 
 BASE_DIR = Path(__file__).resolve().parents[1]
 PROJECT_ROOT = BASE_DIR.parent
-MODELS_DIR = PROJECT_ROOT / "models"
+MODELS_DIR = Path(settings.MODELS_DIR) if settings.MODELS_DIR else PROJECT_ROOT / "models"
 
-# 캐시(모델/라벨)
+# 캐시(모델/라벨) - 카테고리별 (버전, 모델, 라벨)
 _model_cache = {}
-_label_cache = {}
 
+# 예측 결과 캐시
+_result_cache = PredictionCache(
+    settings.PREDICT_CACHE_SIZE, settings.PREDICT_CACHE_DIR, settings.PREDICT_CACHE_DISK_MAX
+)
+
+ROUTE = "/predict"
+
+
+@metrics.register_collector
+def _cache_metrics():
+    st = _result_cache.stats()
+    return [
+        ("zse_predict_cache_entries", "gauge", "Prediction cache entries in memory", {}, st["size"]),
+        ("zse_predict_cache_lookups_total", "counter", "Prediction cache lookups", {"result": "hit"}, st["hits"]),
+        ("zse_predict_cache_lookups_total", "counter", "Prediction cache lookups", {"result": "disk_hit"}, st["disk_hits"]),
+        ("zse_predict_cache_lookups_total", "counter", "Prediction cache lookups", {"result": "miss"}, st["misses"]),
+        ("zse_predict_cache_hit_ratio", "gauge", "Prediction cache hit ratio", {}, st["hit_rate"]),
+    ]
 
-def _load_model_and_labels(category_name: str):
-    # 모델 + 라벨 로드
-    if category_name in _model_cache:
-        return _model_cache[category_name], _label_cache[category_name]
 
+def _model_files(category_name: str):
     dir_ = MODELS_DIR / category_name
-    model_file = dir_ / "best.keras"
-    label_file = dir_ / "label_map.json"
+    return dir_ / "best.keras", dir_ / "label_map.json"
+
+
+def _model_version(category_name: str) -> str:
+    # 파일 수정시간/크기 기반 버전 (파일이 바뀌면 캐시 자동 무효화)
+    model_file, label_file = _model_files(category_name)
 
     if not model_file.exists() or not label_file.exists():
         raise FileNotFoundError("model or label missing")
 
+    parts = []
+    for f in (model_file, label_file):
+        st = f.stat()
+        parts.append(f"{st.st_mtime_ns}-{st.st_size}")
+    return ":".join(parts)
+
+
+def _load_model_and_labels(category_name: str, version: str):
+    # 모델 + 라벨 로드
+    cached = _model_cache.get(category_name)
+    if cached and cached[0] == version:
+        return cached[1], cached[2]
+
+    model_file, label_file = _model_files(category_name)
     model = tf.keras.models.load_model(model_file)
 
     with open(label_file, "r", encoding="utf-8") as f:
@@ -46,8 +80,7 @@ def _load_model_and_labels(category_name: str):
     else:
         labels = raw
 
-    _model_cache[category_name] = model
-    _label_cache[category_name] = labels
+    _model_cache[category_name] = (version, model, labels)
     return model, labels
 
 
@@ -66,7 +99,7 @@ async def predict_product(
     db: Session = Depends(get_db),
 ):
     # 카테고리 확인
-    cat = db.query(models.Category).filter(models.Category.id == category_id).first()
+    cat = crud.get_category_by_id(db, category_id)
     if not cat:
         raise HTTPException(400, "invalid category_id")
 
@@ -74,41 +107,60 @@ async def predict_product(
     if file.content_type is None or not file.content_type.startswith("image/"):
         raise HTTPException(400, "image only")
 
-    img_bytes = await file.read()
+    with metrics.stage(ROUTE, "upload_read"):
+        img_bytes = await file.read()
 
-    # 모델 준비
+    # 모델 버전 확인
     try:
-        model, labels = _load_model_and_labels(cat.name)
+        version = _model_version(cat.name)
     except Exception as e:
         raise HTTPException(500, str(e))
 
-    # 예측
-    try:
-        x = _preprocess_image(img_bytes)
-        preds = model.predict(x)[0]
-    except Exception as e:
-        raise HTTPException(500, f"predict error: {e}")
-
-    # topk
-    k = min(5, preds.shape[0])
-    idxs = np.argsort(preds)[::-1][:k]
+    key = make_key(img_bytes, category_id, version)
+    top_labels = _result_cache.get(key, category_id, version)
+
+    if top_labels is None:
+        # 모델 준비
+        try:
+            with metrics.stage(ROUTE, "model_load"):
+                model, labels = _load_model_and_labels(cat.name, version)
+        except Exception as e:
+            raise HTTPException(500, str(e))
+
+        # 예측
+        try:
+            with metrics.stage(ROUTE, "decode_preprocess"):
+                x = _preprocess_image(img_bytes)
+            with metrics.stage(ROUTE, "forward"):
+                preds = model.predict(x)[0]
+        except Exception as e:
+            raise HTTPException(500, f"predict error: {e}")
+
+        # topk
+        k = min(5, preds.shape[0])
+        idxs = np.argsort(preds)[::-1][:k]
+        top_labels = [labels[idx] for idx in idxs]
+
+        _result_cache.set(key, top_labels, category_id, version)
 
     results = []
-    for rank, idx in enumerate(idxs, start=1):
-        label = labels[idx]
-        product = (
-            db.query(models.Product)
-            .filter(models.Product.name == label, models.Product.category_id == category_id)
-            .first()
-        )
-
-        results.append({
-            "rank": rank,
-            "name": label,
-            "product_id": product.id if product else None
-        })
+    with metrics.stage(ROUTE, "db_lookup"):
+        for rank, label in enumerate(top_labels, start=1):
+            product = crud.get_product_by_name(db, label, category_id)
+
+            results.append({
+                "rank": rank,
+                "name": label,
+                "product_id": product.id if product else None
+            })
 
     if not results:
         raise HTTPException(500, "no prediction")
 
     return {"results": results}
+
+
+@router.get("/cache")
+def predict_cache_stats():
+    # 캐시 적중률 확인용
+    return _result_cache.stats()
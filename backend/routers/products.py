@@ -1,6 +1,6 @@
 # 제품 정보
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List
 
@@ -9,6 +9,9 @@ from backend import crud, schemas, models
 
 router = APIRouter(prefix="/products", tags=["products"])
 
+# /products/full 한 번에 받을 수 있는 최대 개수
+MAX_BATCH_IDS = 100
+
 
 @router.get("", response_model=List[schemas.ProductListItem])
 def list_products(db: Session = Depends(get_db)):
@@ -32,13 +35,7 @@ def list_products(db: Session = Depends(get_db)):
     return result
 
 
-@router.get("/{product_id}/full", response_model=schemas.ProductDetail)
-def get_product_detail(product_id: int, db: Session = Depends(get_db)):
-    # 단일 제품
-    p = crud.get_product_by_id(db, product_id)
-    if not p:
-        raise HTTPException(status_code=404, detail="Product not found")
-
+def _to_detail(p: models.Product) -> dict:
     # 카테고리
     if p.category:
         category = {"id": p.category.id, "name": p.category.name}
@@ -80,3 +77,51 @@ def get_product_detail(product_id: int, db: Session = Depends(get_db)):
         "sweeteners": sweets,
         "nutrition": nf,
     }
+
+
+@router.get("/full", response_model=schemas.ProductDetailBatch)
+def get_products_detail(
+    ids: str = Query(..., description="쉼표로 구분한 제품 id (예: 1,2,3)"),
+    include: str = Query("", description="같이 받을 목록: categories,sweeteners"),
+    db: Session = Depends(get_db),
+):
+    # 여러 제품 상세 (비교 / 비슷한 제품 화면용)
+    try:
+        product_ids = [int(x) for x in ids.split(",") if x.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be comma separated integers")
+
+    # 순서 유지 + 중복 제거
+    product_ids = list(dict.fromkeys(product_ids))
+    if not product_ids:
+        raise HTTPException(status_code=400, detail="ids is empty")
+    if len(product_ids) > MAX_BATCH_IDS:
+        raise HTTPException(status_code=400, detail=f"too many ids (max {MAX_BATCH_IDS})")
+
+    extra = {x.strip() for x in include.split(",") if x.strip()}
+    unknown = extra - {"categories", "sweeteners"}
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"unknown include: {', '.join(sorted(unknown))}")
+
+    found = {p.id: p for p in crud.get_products_detail_by_ids(db, product_ids)}
+
+    result = {
+        "products": [_to_detail(found[i]) for i in product_ids if i in found],
+        "missing": [i for i in product_ids if i not in found],
+    }
+    if "categories" in extra:
+        result["categories"] = crud.get_categories(db)
+    if "sweeteners" in extra:
+        result["sweeteners"] = crud.get_sweeteners(db)
+
+    return result
+
+
+@router.get("/{product_id}/full", response_model=schemas.ProductDetail)
+def get_product_detail(product_id: int, db: Session = Depends(get_db)):
+    # 단일 제품
+    p = crud.get_product_by_id(db, product_id)
+    if not p:
+        raise HTTPException(status_code=404, detail="Product not found")
+
+    return _to_detail(p)
@@ -67,3 +67,11 @@ class ProductDetail(BaseModel):
 
     class Config:
         orm_mode = True
+
+
+class ProductDetailBatch(BaseModel):
+    products: List[ProductDetail] = []
+    missing: List[int] = []
+    # include=categories,sweeteners 일 때만 채움
+    categories: Optional[List[Category]] = None
+    sweeteners: Optional[List[Sweetener]] = None
@@ -0,0 +1,2 @@
+# bench/__init__.py
+# 벤치마크 / 부하 테스트 패키지
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+# 시드된 sqlite DB 에서 crud / predict 가 쓰는 쿼리의 실행 계획(EXPLAIN QUERY PLAN)을 확인
+# 인덱스를 타지 않는 쿼리가 있으면 exit 1
+#   python -m bench.explain --products 10000
+
+import argparse
+import os
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from bench import seed
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+
+@contextmanager
+def capture(engine):
+    # 실행된 (sql, params) 를 순서대로 모음
+    seen = []
+
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        seen.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", _before)
+    try:
+        yield seen
+    finally:
+        event.remove(engine, "before_cursor_execute", _before)
+
+
+def run_queries(db, models, crud):
+    # 라우터가 실제로 실행하는 경로들
+    cases = []
+
+    def case(name, fn):
+        cases.append((name, fn))
+
+    case("crud.get_categories", lambda: crud.get_categories(db))
+    case("crud.get_sweeteners", lambda: crud.get_sweeteners(db))
+    case("crud.get_products", lambda: crud.get_products(db))
+    case("crud.get_product_by_id", lambda: crud.get_product_by_id(db, 1))
+    case("predict: crud.get_category_by_id", lambda: crud.get_category_by_id(db, 1))
+
+    first = db.query(models.Product).order_by(models.Product.id).first()
+    case(
+        "predict: crud.get_product_by_name",
+        lambda: crud.get_product_by_name(db, first.name, first.category_id),
+    )
+
+    # 상세/목록에서의 관계 로드
+    def lazy():
+        db.expire_all()
+        p = crud.get_product_by_id(db, first.id)
+        _ = p.category, p.nutrition
+        for ps in p.sweeteners:
+            _ = ps.sweetener
+    case("product relationships", lazy)
+
+    # 대체당 기준 필터링
+    case(
+        "sweetener filter",
+        lambda: db.query(models.ProductSweetener.product_id)
+        .filter(models.ProductSweetener.sweetener_id == 1)
+        .all(),
+    )
+
+    return cases
+
+
+def plan_problems(sql, rows):
+    # 조건이 있는 쿼리는 SEARCH / 인덱스 SCAN 이어야 함
+    # 전체 목록(조건 없음)은 PK 순서 SCAN 허용, 정렬용 임시 B-tree 는 항상 불가
+    has_where = " WHERE " in " ".join(sql.split()).upper()
+    bad = []
+    for row in rows:
+        detail = row[-1]
+        if "USE TEMP B-TREE" in detail:
+            bad.append(detail)
+        elif has_where and detail.startswith("SCAN") and "USING" not in detail:
+            bad.append(detail)
+    return bad
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--workdir", default="bench/work")
+    ap.add_argument("--products", type=int, default=10000)
+    args = ap.parse_args()
+
+    workdir = (PROJECT_ROOT / args.workdir).resolve()
+    workdir.mkdir(parents=True, exist_ok=True)
+    db_url = f"sqlite:///{workdir / 'explain.db'}"
+
+    seed.seed(db_url, args.products)
+
+    os.environ["DB_URL"] = db_url
+    from backend import crud, models
+
+    engine = create_engine(db_url)
+    Session = sessionmaker(bind=engine)
+
+    failed = 0
+    with Session() as db:
+        for name, fn in run_queries(db, models, crud):
+            with capture(engine) as statements:
+                fn()
+            print(f"== {name}")
+            for sql, params in statements:
+                with engine.connect() as conn:
+                    rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + sql, params).fetchall()
+                bad = plan_problems(sql, rows)
+                flat = " ".join(sql.split())
+                print(("  FAIL " if bad else "  ok   ") + flat[:120])
+                for r in rows:
+                    print("       " + r[-1])
+                failed += bool(bad)
+
+    print("failed:", failed)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
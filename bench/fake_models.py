@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+# 카테고리별 label_map.json 에 맞춘 작은 랜덤 가중치 Keras 모델 생성
+#   python -m bench.fake_models --out bench/models
+
+import argparse
+import json
+import shutil
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_MODELS_DIR = PROJECT_ROOT / "models"
+
+
+def build_model(num_classes, img_size=224, seed=42):
+    import tensorflow as tf
+    from tensorflow import keras
+    from tensorflow.keras import layers
+
+    tf.random.set_seed(seed)
+
+    # 입력 형태만 실제 모델과 같게 (EfficientNet 대신 아주 얕은 네트워크)
+    inputs = keras.Input((img_size, img_size, 3))
+    x = layers.AveragePooling2D(8)(inputs)
+    x = layers.Conv2D(8, 3, activation="relu")(x)
+    x = layers.GlobalAveragePooling2D()(x)
+    outputs = layers.Dense(num_classes, activation="softmax")(x)
+    return keras.Model(inputs, outputs)
+
+
+def make_models(out_dir, src_dir=SRC_MODELS_DIR, img_size=224):
+    out_dir = Path(out_dir)
+    made = {}
+
+    for cat_dir in sorted(Path(src_dir).iterdir()):
+        label_file = cat_dir / "label_map.json"
+        if not cat_dir.is_dir() or not label_file.exists():
+            continue
+
+        with open(label_file, "r", encoding="utf-8") as f:
+            labels = json.load(f)
+
+        dst = out_dir / cat_dir.name
+        dst.mkdir(parents=True, exist_ok=True)
+
+        model = build_model(len(labels), img_size)
+        model.save(dst / "best.keras")
+        shutil.copy2(label_file, dst / "label_map.json")
+
+        made[cat_dir.name] = len(labels)
+
+    return made
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--out", default="bench/models")
+    ap.add_argument("--image-size", type=int, default=224)
+    args = ap.parse_args()
+
+    print(make_models(args.out, img_size=args.image_size))
+
+
+if __name__ == "__main__":
+    main()
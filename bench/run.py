@@ -0,0 +1,394 @@
+# -*- coding: utf-8 -*-
+# API 부하 테스트: DB 시드 + 가짜 모델 준비 -> uvicorn 실행 -> 엔드포인트별 측정 -> JSON 리포트
+#   python -m bench.run --products 10000 --concurrency 8 --requests 500 --out before.json
+#   python -m bench.run --url http://127.0.0.1:8000 ...   (이미 떠 있는 서버에 측정만)
+
+import argparse
+import http.client
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from io import BytesIO
+from pathlib import Path
+from urllib.parse import urlparse
+
+from bench import fake_models, seed
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+ENDPOINTS = ["products", "product_full", "products_batch", "categories", "predict"]
+
+# 엔드포인트 -> /metrics 의 라우트 템플릿
+ROUTES = {
+    "products": "/products",
+    "product_full": "/products/{product_id}/full",
+    "products_batch": "/products/full",
+    "categories": "/categories",
+    "predict": "/predict",
+}
+
+
+def percentile(values, p):
+    if not values:
+        return None
+    values = sorted(values)
+    k = (len(values) - 1) * p / 100
+    lo = int(k)
+    hi = min(lo + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (k - lo)
+
+
+def make_images(n, size=(320, 320), seed_value=42):
+    from PIL import Image
+    import numpy as np
+
+    rng = np.random.default_rng(seed_value)
+    out = []
+    for _ in range(n):
+        arr = rng.integers(0, 256, size=(size[1], size[0], 3), dtype=np.uint8)
+        buf = BytesIO()
+        Image.fromarray(arr).save(buf, format="JPEG", quality=85)
+        out.append(buf.getvalue())
+    return out
+
+
+def multipart(fields, file_field, filename, content, content_type):
+    boundary = uuid.uuid4().hex
+    parts = []
+    for k, v in fields.items():
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{k}"\r\n\r\n{v}\r\n'.encode()
+        )
+    parts.append(
+        f'--{boundary}\r\nContent-Disposition: form-data; name="{file_field}"; '
+        f'filename="{filename}"\r\nContent-Type: {content_type}\r\n\r\n'.encode()
+        + content + b"\r\n"
+    )
+    parts.append(f"--{boundary}--\r\n".encode())
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
+
+
+class Client:
+    # 워커 스레드마다 keep-alive 연결 하나
+    def __init__(self, base_url):
+        u = urlparse(base_url)
+        self.host = u.hostname
+        self.port = u.port or 80
+        self.conn = None
+
+    def request(self, method, path, body=None, headers=None):
+        for attempt in range(2):
+            if self.conn is None:
+                self.conn = http.client.HTTPConnection(self.host, self.port, timeout=60)
+            try:
+                self.conn.request(method, path, body=body, headers=headers or {})
+                resp = self.conn.getresponse()
+                data = resp.read()
+                return resp.status, data
+            except (http.client.HTTPException, OSError):
+                self.conn.close()
+                self.conn = None
+                if attempt:
+                    raise
+
+    def close(self):
+        if self.conn:
+            self.conn.close()
+
+
+def scrape_db_queries(base_url):
+    # route -> (쿼리 합계, 요청 수)
+    c = Client(base_url)
+    try:
+        _, data = c.request("GET", "/metrics")
+    finally:
+        c.close()
+
+    out = {}
+    pat = re.compile(r'^zse_http_request_db_queries_(sum|count)\{method="(\w+)",route="([^"]*)"\} (\S+)$')
+    for line in data.decode("utf-8").splitlines():
+        m = pat.match(line)
+        if not m:
+            continue
+        kind, _, route, value = m.groups()
+        s, n = out.get(route, (0.0, 0.0))
+        if kind == "sum":
+            s += float(value)
+        else:
+            n += float(value)
+        out[route] = (s, n)
+    return out
+
+
+def scrape_predict_cache(base_url):
+    # /predict/cache 조회 횟수 (없는 서버면 None)
+    c = Client(base_url)
+    try:
+        status, data = c.request("GET", "/predict/cache")
+    finally:
+        c.close()
+    if status != 200:
+        return None
+    st = json.loads(data)
+    return {k: st.get(k, 0) for k in ("hits", "disk_hits", "misses")}
+
+
+def make_request_fn(name, ctx):
+    rng = random.Random(f"{ctx['seed']}-{name}")
+
+    if name == "products":
+        return lambda: ("GET", "/products", None, None)
+    if name == "categories":
+        return lambda: ("GET", "/categories", None, None)
+    if name == "product_full":
+        n = ctx["n_products"]
+        return lambda: ("GET", f"/products/{rng.randint(1, n)}/full", None, None)
+    if name == "products_batch":
+        n = ctx["n_products"]
+
+        def fn():
+            ids = ",".join(str(rng.randint(1, n)) for _ in range(ctx["batch_size"]))
+            return "GET", f"/products/full?ids={ids}", None, None
+        return fn
+    if name == "predict":
+        images = ctx["images"]
+        cats = ctx["category_ids"]
+
+        def fn():
+            body, ctype = multipart(
+                {"category_id": rng.choice(cats)}, "file", "bench.jpg",
+                rng.choice(images), "image/jpeg",
+            )
+            return "POST", "/predict", body, {"Content-Type": ctype}
+        return fn
+    raise ValueError(name)
+
+
+def run_endpoint(base_url, name, ctx, n_requests, concurrency, warmup):
+    make = make_request_fn(name, ctx)
+
+    # 워밍업 (모델 로드 등은 측정에서 제외)
+    c = Client(base_url)
+    try:
+        for _ in range(warmup):
+            method, path, body, headers = make()
+            c.request(method, path, body, headers)
+    finally:
+        c.close()
+
+    before = scrape_db_queries(base_url).get(ROUTES[name], (0.0, 0.0))
+    cache_before = scrape_predict_cache(base_url) if name == "predict" else None
+
+    lat = []
+    errors = 0
+    lock = threading.Lock()
+    counter = iter(range(n_requests))
+
+    def worker():
+        nonlocal errors
+        cli = Client(base_url)
+        try:
+            while True:
+                with lock:
+                    if next(counter, None) is None:
+                        return
+                    method, path, body, headers = make()
+                t0 = time.perf_counter()
+                try:
+                    status, _ = cli.request(method, path, body, headers)
+                    ok = 200 <= status < 300
+                except Exception:
+                    ok = False
+                dt = time.perf_counter() - t0
+                with lock:
+                    lat.append(dt)
+                    if not ok:
+                        errors += 1
+        finally:
+            cli.close()
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - start
+
+    after = scrape_db_queries(base_url).get(ROUTES[name], (0.0, 0.0))
+    q_sum = after[0] - before[0]
+    q_cnt = after[1] - before[1]
+
+    # 캐시 적중이 섞이면 추론 지연과 비교가 안 되므로 같이 기록
+    cache = None
+    if cache_before is not None:
+        cache_after = scrape_predict_cache(base_url)
+        if cache_after is not None:
+            cache = {k: cache_after[k] - cache_before[k] for k in cache_before}
+
+    ms = [x * 1000 for x in lat]
+    result = {
+        "requests": len(lat),
+        "errors": errors,
+        "concurrency": concurrency,
+        "wall_s": round(wall, 3),
+        "throughput_rps": round(len(lat) / wall, 2) if wall else None,
+        "latency_ms": {
+            "mean": round(sum(ms) / len(ms), 2) if ms else None,
+            "p50": round(percentile(ms, 50), 2) if ms else None,
+            "p95": round(percentile(ms, 95), 2) if ms else None,
+            "p99": round(percentile(ms, 99), 2) if ms else None,
+            "max": round(max(ms), 2) if ms else None,
+        },
+        "db_queries_total": q_sum,
+        "db_queries_per_request": round(q_sum / q_cnt, 2) if q_cnt else None,
+    }
+    if name == "predict":
+        result["predict_cache"] = cache
+    return result
+
+
+def wait_ready(base_url, proc, timeout):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError("server exited during startup")
+        try:
+            c = Client(base_url)
+            status, _ = c.request("GET", "/categories")
+            c.close()
+            if status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError("server not ready")
+
+
+def start_server(db_url, models_dir, port, workers, predict_cache):
+    env = dict(os.environ)
+    env["DB_URL"] = db_url
+    env.pop("PREDICT_CACHE_DIR", None)
+    if not predict_cache:
+        env["PREDICT_CACHE_SIZE"] = "0"
+    if models_dir:
+        env["MODELS_DIR"] = str(models_dir)
+    cmd = [
+        sys.executable, "-m", "uvicorn", "backend.main:app",
+        "--host", "127.0.0.1", "--port", str(port),
+        "--workers", str(workers), "--log-level", "warning",
+    ]
+    # 서버 stdout(keras 진행 표시 등)이 JSON 리포트에 섞이지 않도록
+    return subprocess.Popen(cmd, cwd=PROJECT_ROOT, env=env, stdout=subprocess.DEVNULL)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--url", default=None, help="이미 실행 중인 서버 (지정 시 시드/서버 실행 생략)")
+    ap.add_argument("--workdir", default="bench/work")
+    ap.add_argument("--products", type=int, default=10000)
+    ap.add_argument("--endpoints", default=",".join(ENDPOINTS))
+    ap.add_argument("--concurrency", type=int, default=8)
+    ap.add_argument("--requests", type=int, default=500, help="엔드포인트별 요청 수")
+    ap.add_argument("--products-requests", type=int, default=None, help="/products 요청 수 (기본: --requests)")
+    ap.add_argument("--warmup", type=int, default=5)
+    ap.add_argument("--batch-size", type=int, default=20, help="/products/full 요청당 id 수")
+    ap.add_argument("--images", type=int, default=32, help="/predict 에 쓰는 서로 다른 이미지 수")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--workers", type=int, default=1, help="1 초과 시 DB 쿼리 수는 일부 워커만 집계됨")
+    ap.add_argument("--predict-cache", action="store_true", help="예측 결과 캐시 켜고 측정 (기본: 끔, 매번 추론)")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--out", default=None)
+    args = ap.parse_args()
+
+    endpoints = [e for e in args.endpoints.split(",") if e]
+    for e in endpoints:
+        if e not in ENDPOINTS:
+            ap.error(f"unknown endpoint: {e}")
+
+    random.seed(args.seed)
+    workdir = (PROJECT_ROOT / args.workdir).resolve()
+    workdir.mkdir(parents=True, exist_ok=True)
+
+    proc = None
+    setup = {}
+    base_url = args.url
+
+    if base_url is None:
+        db_url = f"sqlite:///{workdir / 'bench.db'}"
+        t0 = time.perf_counter()
+        setup["seed"] = seed.seed(db_url, args.products, args.seed)
+        setup["seed_s"] = round(time.perf_counter() - t0, 2)
+
+        models_dir = None
+        if "predict" in endpoints:
+            models_dir = workdir / "models"
+            t0 = time.perf_counter()
+            setup["models"] = fake_models.make_models(models_dir)
+            setup["models_s"] = round(time.perf_counter() - t0, 2)
+
+        base_url = f"http://127.0.0.1:{args.port}"
+        proc = start_server(db_url, models_dir, args.port, args.workers, args.predict_cache)
+
+    try:
+        if proc:
+            wait_ready(base_url, proc, timeout=120)
+
+        c = Client(base_url)
+        try:
+            _, data = c.request("GET", "/categories")
+        finally:
+            c.close()
+
+        ctx = {
+            "seed": args.seed,
+            "batch_size": args.batch_size,
+            "n_products": setup.get("seed", {}).get("products", args.products),
+            "category_ids": [cat["id"] for cat in json.loads(data)],
+            "images": make_images(args.images, seed_value=args.seed) if "predict" in endpoints else [],
+        }
+
+        results = {}
+        for e in endpoints:
+            n = args.requests
+            if e == "products" and args.products_requests is not None:
+                n = args.products_requests
+            results[e] = run_endpoint(base_url, e, ctx, n, args.concurrency, args.warmup)
+            print(e, json.dumps(results[e]), file=sys.stderr)
+    finally:
+        if proc:
+            proc.terminate()
+            proc.wait(timeout=30)
+
+    report = {
+        "config": {
+            "url": args.url,
+            "products": args.products,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "workers": args.workers,
+            "batch_size": args.batch_size,
+            "images": args.images,
+            # --url 이면 서버 설정을 따름 (결과의 predict_cache 적중 수 참고)
+            "predict_cache": args.predict_cache if args.url is None else None,
+            "seed": args.seed,
+        },
+        "setup": setup,
+        "results": results,
+    }
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+# db_source_products.csv 로 벤치마크용 DB 를 만들고 제품 수를 합성으로 늘리는 스크립트
+#   python -m bench.seed --db-url sqlite:///bench/bench.db --products 10000
+
+import argparse
+import csv
+import os
+import random
+from pathlib import Path
+
+from sqlalchemy import create_engine, insert
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+CSV_PATH = PROJECT_ROOT / "db_source_products.csv"
+THUMB_DIR = PROJECT_ROOT / "backend" / "static" / "thumbnails"
+THUMB_EXTS = [".png", ".jpg", ".jpeg", ".webp"]
+
+# csv 컬럼 -> (대체당 이름, kcal/g)
+SWEETENER_COLS = {
+    "sugar_alcohol_g": ("당알코올", 2.4),
+    "allulose_g": ("알룰로오스", 0.2),
+    "erythritol_g": ("에리스리톨", 0.0),
+}
+
+NUTRITION_COLS = [
+    "kcal", "carbohydrate_g", "sugar_g", "fat_g",
+    "saturated_fat_g", "trans_fat_g", "protein_g", "sodium_mg",
+]
+
+
+def _float(v):
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return None
+
+
+def _thumbnail(name):
+    for e in THUMB_EXTS:
+        if (THUMB_DIR / (name + e)).exists():
+            return "/static/thumbnails/" + name + e
+    return None
+
+
+def load_rows():
+    with open(CSV_PATH, "r", encoding="utf-8-sig", newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def seed(db_url, n_products, seed_value=42, batch=5000):
+    # backend.models 는 import 시 settings 를 읽으므로 먼저 지정
+    os.environ["DB_URL"] = db_url
+    from backend import models
+
+    random.seed(seed_value)
+
+    engine = create_engine(db_url)
+    models.Base.metadata.drop_all(engine)
+    models.Base.metadata.create_all(engine)
+
+    rows = load_rows()
+    if n_products is None or n_products < len(rows):
+        n_products = len(rows)
+
+    categories = {}
+    for r in rows:
+        categories[int(r["category_id"])] = r["category_name"]
+
+    sweeteners = []
+    sweet_ids = {}
+    for i, (col, (name, kcal)) in enumerate(SWEETENER_COLS.items(), start=1):
+        sweeteners.append({"id": i, "name": name, "kcal_per_g": kcal, "description": None})
+        sweet_ids[col] = i
+
+    products, nutrition, links = [], [], []
+    pid = 0
+
+    def flush(conn):
+        if products:
+            conn.execute(insert(models.Product), products)
+        if nutrition:
+            conn.execute(insert(models.NutritionFacts), nutrition)
+        if links:
+            conn.execute(insert(models.ProductSweetener), links)
+        products.clear()
+        nutrition.clear()
+        links.clear()
+
+    with engine.begin() as conn:
+        conn.execute(insert(models.Category), [{"id": k, "name": v} for k, v in sorted(categories.items())])
+        conn.execute(insert(models.Sweetener), sweeteners)
+
+        # 원본 행을 먼저, 이후 " #n" 을 붙인 합성 제품으로 채움
+        while pid < n_products:
+            r = rows[pid % len(rows)]
+            copy = pid // len(rows)
+            pid += 1
+
+            name = r["product_name"] if copy == 0 else f"{r['product_name']} #{copy}"
+            products.append({
+                "id": pid,
+                "name": name,
+                "brand": r["brand"] or None,
+                "category_id": int(r["category_id"]),
+                "volume": r["total_weight"] or None,
+                "image_url": _thumbnail(r["product_name"]),
+            })
+
+            nf = {"product_id": pid}
+            for c in NUTRITION_COLS:
+                v = _float(r[c])
+                # 합성 제품은 값을 조금씩 흔들어 줌
+                if v is not None and copy:
+                    v = round(v * random.uniform(0.8, 1.2), 2)
+                nf[c] = v
+            nutrition.append(nf)
+
+            for col, sid in sweet_ids.items():
+                v = _float(r[col])
+                if v is not None:
+                    links.append({
+                        "product_id": pid,
+                        "sweetener_id": sid,
+                        "amount_per_serving_mg": v * 1000,
+                        "amount_per_100ml_mg": None,
+                    })
+
+            if len(products) >= batch:
+                flush(conn)
+
+        flush(conn)
+
+    engine.dispose()
+    return {"products": n_products, "categories": len(categories), "sweeteners": len(sweeteners)}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--db-url", default="sqlite:///bench/bench.db")
+    ap.add_argument("--products", type=int, default=10000)
+    ap.add_argument("--seed", type=int, default=42)
+    args = ap.parse_args()
+
+    print(seed(args.db_url, args.products, args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -10,14 +10,19 @@ async function initDetailPage() {
       return;
     }
 
-    const [prodFull, cats, sweets] = await Promise.all([
-      fetchJSON(`products/${id}/full`),
-      fetchJSON("categories"),
-      fetchJSON("sweeteners"),
-    ]);
+    // 제품 + 카테고리 목록을 한 번에
+    const data = await fetchJSON(
+      `products/full?ids=${encodeURIComponent(id)}&include=categories`
+    );
 
     const sweetNames = ["알룰로오스", "에리스리톨", "당알코올"];
-    initGlobalNav("products", cats, sweetNames);
+    initGlobalNav("products", data.categories || [], sweetNames);
+
+    const prodFull = (data.products || [])[0];
+    if (!prodFull) {
+      detailName.textContent = "제품 정보가 존재하지 않습니다.";
+      return;
+    }
 
     fillDetail(prodFull);
   } catch (err) {
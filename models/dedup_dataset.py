@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+# filtered_dataset 안의 재업로드/리사이즈 중복 이미지를 perceptual hash 로 묶어서 대표 1장만 남기는 스크립트
+# 결과는 manifest(csv)로만 남기고 원본 파일은 건드리지 않음 -> train_multi_category_filtered.py 가 사용
+
+import csv
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import numpy as np
+from PIL import Image
+
+CONFIG = {
+    "root_dir": "./filtered_dataset",
+    "manifest": "./filtered_dataset/dedup_manifest.csv",
+    # 이 거리(64비트 중 다른 비트 수) 이하면 같은 사진으로 보고 1장만 남김
+    "dup_threshold": 4,
+    # 이 거리 이하면 같은 그룹 -> 학습/검증 분리 시 같은 쪽으로
+    "group_threshold": 8,
+    # 그룹이 연쇄로 커지지 않도록 상한 (넘으면 더 묶지 않음)
+    # 상한 때문에 못 묶은 쌍은 학습/검증에 갈라질 수 있음 -> "capped pairs" 로 출력
+    "max_group_size": 20,
+    # 중복 묶음도 상한: 연쇄(A~B~C...)로 커지면 서로 다른 사진까지 지워짐
+    # 못 묶은 쌍은 둘 다 남고 "dup capped" 로 출력
+    "max_dup_size": 10,
+    # 다른 라벨끼리 중복으로 보이는 쌍 (라벨 노이즈 후보)
+    "label_noise_csv": "./filtered_dataset/dedup_label_noise.csv",
+    "workers": 8,
+    "exts": [".jpg", ".jpeg", ".png", ".bmp", ".webp"],
+}
+
+HASH_SIZE = 8
+DCT_SIZE = 32
+
+
+def _dct_matrix(n):
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    m = np.cos(np.pi * (2 * i + 1) * k / (2 * n)) * np.sqrt(2.0 / n)
+    m[0] /= np.sqrt(2.0)
+    return m
+
+
+_DCT = _dct_matrix(DCT_SIZE)
+
+
+def phash(path):
+    # 64비트 pHash + 해상도 (대표 이미지 선택용)
+    try:
+        with Image.open(path) as img:
+            size = img.size[0] * img.size[1]
+            g = img.convert("L").resize((DCT_SIZE, DCT_SIZE), Image.LANCZOS)
+    except Exception:
+        return None, 0
+
+    arr = np.asarray(g, dtype=np.float64)
+    coef = (_DCT @ arr @ _DCT.T)[:HASH_SIZE, :HASH_SIZE].flatten()
+    # DC 성분은 밝기라 중앙값 계산에서 제외
+    bits = coef > np.median(coef[1:])
+
+    h = 0
+    for b in bits:
+        h = (h << 1) | int(b)
+    return h, size
+
+
+def _popcount(x):
+    # uint64 배열 비트 수
+    x = x - ((x >> np.uint64(1)) & np.uint64(0x5555555555555555))
+    x = (x & np.uint64(0x3333333333333333)) + ((x >> np.uint64(2)) & np.uint64(0x3333333333333333))
+    x = (x + (x >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    return (x * np.uint64(0x0101010101010101)) >> np.uint64(56)
+
+
+class UnionFind:
+    def __init__(self, n):
+        self.parent = list(range(n))
+        self.size = [1] * n
+
+    def find(self, a):
+        while self.parent[a] != a:
+            self.parent[a] = self.parent[self.parent[a]]
+            a = self.parent[a]
+        return a
+
+    def union(self, a, b, max_size=None):
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return True
+        if max_size is not None and self.size[ra] + self.size[rb] > max_size:
+            return False
+        lo, hi = min(ra, rb), max(ra, rb)
+        self.parent[hi] = lo
+        self.size[lo] += self.size[hi]
+        return True
+
+
+def near_pairs(hashes, threshold):
+    # [(a, b, 거리)] (a < b)
+    # multi-index hashing: 64비트를 threshold+1 개 구간으로 나누면
+    # 거리 <= threshold 인 두 해시는 적어도 한 구간이 완전히 같음 (비둘기집)
+    # -> 같은 구간 값을 가진 후보끼리만 실제 거리 계산
+    n = len(hashes)
+    if n < 2:
+        return []
+
+    h = np.array(hashes, dtype=np.uint64)
+    bands = threshold + 1
+    edges = np.linspace(0, 64, bands + 1).astype(int)
+
+    pairs = {}
+    for lo, hi in zip(edges[:-1], edges[1:]):
+        mask = np.uint64((1 << (hi - lo)) - 1)
+        keys = (h >> np.uint64(lo)) & mask
+
+        buckets = defaultdict(list)
+        for i, k in enumerate(keys.tolist()):
+            buckets[k].append(i)
+
+        for idx in buckets.values():
+            if len(idx) < 2:
+                continue
+            idx = np.array(idx)
+            sub = h[idx]
+            for j in range(len(idx) - 1):
+                d = _popcount(sub[j] ^ sub[j + 1:])
+                for m in np.nonzero(d <= threshold)[0]:
+                    a, b = int(idx[j]), int(idx[j + 1 + m])
+                    pairs[(min(a, b), max(a, b))] = int(d[m])
+
+    return [(a, b, d) for (a, b), d in pairs.items()]
+
+
+def cluster(n, pairs, labels, threshold, max_size=None):
+    # 같은 라벨끼리만, 가까운 쌍부터 묶음
+    # -> (대표 번호 목록, 상한 때문에 못 묶은 쌍 수)
+    uf = UnionFind(n)
+    capped = 0
+    for a, b, d in sorted(pairs, key=lambda x: x[2]):
+        if d <= threshold and labels[a] == labels[b]:
+            if not uf.union(a, b, max_size):
+                capped += 1
+    return [uf.find(i) for i in range(n)], capped
+
+
+def dedup_category(cat_dir, cfg, pool):
+    items = []
+    for cls_dir in sorted(p for p in cat_dir.iterdir() if p.is_dir()):
+        for fp in sorted(cls_dir.iterdir()):
+            if fp.suffix.lower() in cfg["exts"]:
+                items.append((cls_dir.name, fp))
+
+    results = list(pool.map(phash, [fp for _, fp in items], chunksize=32))
+
+    # 읽기 실패한 이미지는 묶지 않고 keep=0 으로만 기록 (학습 쪽 stale 검사용)
+    ok = [(cls, fp, h, size) for (cls, fp), (h, size) in zip(items, results) if h is not None]
+    failed = [(cls, fp) for (cls, fp), (h, _) in zip(items, results) if h is None]
+    hashes = [h for _, _, h, _ in ok]
+    labels = [cls for cls, _, _, _ in ok]
+
+    group_threshold = max(cfg["group_threshold"], cfg["dup_threshold"])
+    pairs = near_pairs(hashes, group_threshold)
+
+    dup, dup_capped = cluster(len(ok), pairs, labels, cfg["dup_threshold"], cfg["max_dup_size"])
+    group, group_capped = cluster(len(ok), pairs, labels, group_threshold, cfg["max_group_size"])
+
+    # 다른 라벨인데 같은 사진으로 보이는 쌍은 고르지 않고 따로 보고
+    noise = []
+    for a, b, d in pairs:
+        if d <= cfg["dup_threshold"] and labels[a] != labels[b]:
+            noise.append({
+                "category": cat_dir.name,
+                "path_a": ok[a][1].relative_to(cat_dir.parent).as_posix(),
+                "label_a": labels[a],
+                "path_b": ok[b][1].relative_to(cat_dir.parent).as_posix(),
+                "label_b": labels[b],
+                "distance": d,
+            })
+
+    # 중복 묶음마다 해상도가 가장 큰 이미지 1장 (같으면 파일 크기)
+    best = {}
+    for i, (_, fp, _, size) in enumerate(ok):
+        score = (size, fp.stat().st_size)
+        if dup[i] not in best or score > best[dup[i]][0]:
+            best[dup[i]] = (score, i)
+    keep = {i for _, i in best.values()}
+
+    rows = []
+    for i, (cls, fp, h, _) in enumerate(ok):
+        rows.append({
+            "category": cat_dir.name,
+            "label": cls,
+            "path": fp.relative_to(cat_dir.parent).as_posix(),
+            "phash": f"{h:016x}",
+            "dup_cluster": f"{cat_dir.name}/{dup[i]}",
+            "group": f"{cat_dir.name}/{group[i]}",
+            "keep": int(i in keep),
+            "status": "ok",
+        })
+    for i, (cls, fp) in enumerate(failed):
+        rows.append({
+            "category": cat_dir.name,
+            "label": cls,
+            "path": fp.relative_to(cat_dir.parent).as_posix(),
+            "phash": "",
+            "dup_cluster": f"{cat_dir.name}/unreadable/{i}",
+            "group": f"{cat_dir.name}/unreadable/{i}",
+            "keep": 0,
+            "status": "unreadable",
+        })
+
+    stats = {
+        "cross_label": len(noise),
+        "dup_capped": dup_capped,
+        "group_capped": group_capped,
+        "unreadable": len(failed),
+    }
+    return rows, noise, stats
+
+
+def main():
+    root = Path(CONFIG["root_dir"])
+    cats = sorted(d for d in root.iterdir() if d.is_dir())
+
+    all_rows = []
+    all_noise = []
+    group_capped = 0
+    with ProcessPoolExecutor(CONFIG["workers"]) as pool:
+        for cat_dir in cats:
+            rows, noise, st = dedup_category(cat_dir, CONFIG, pool)
+            kept = sum(r["keep"] for r in rows)
+            groups = len({r["group"] for r in rows if r["status"] == "ok"})
+            print(
+                f"{cat_dir.name}: {len(rows)} -> {kept} "
+                f"(groups {groups}, cross-label dups {st['cross_label']}, "
+                f"capped pairs {st['group_capped']}, dup capped {st['dup_capped']}, "
+                f"unreadable {st['unreadable']})"
+            )
+            all_rows.extend(rows)
+            all_noise.extend(noise)
+            group_capped += st["group_capped"]
+
+    fields = ["category", "label", "path", "phash", "dup_cluster", "group", "keep", "status"]
+    with open(CONFIG["manifest"], "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(all_rows)
+
+    noise_fields = ["category", "path_a", "label_a", "path_b", "label_b", "distance"]
+    with open(CONFIG["label_noise_csv"], "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=noise_fields)
+        writer.writeheader()
+        writer.writerows(all_noise)
+    if all_noise:
+        print(f"cross-label duplicates: {len(all_noise)} -> {CONFIG['label_noise_csv']} (check labels)")
+
+    if group_capped:
+        print(
+            f"{group_capped} near pairs left in different groups by max_group_size "
+            "(may leak between train/val, raise it if this is large)"
+        )
+
+    total = len(all_rows)
+    kept = sum(r["keep"] for r in all_rows)
+    print(f"total: {total} -> {kept}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 # filtered_dataset 기준으로 카테고리별 EfficientNet 분류 모델을 학습하는 스크립트
 
+import csv
 import json
 import random
 from pathlib import Path
@@ -12,11 +13,15 @@ from tensorflow.keras.applications.efficientnet import EfficientNetB0, preproces
 
 CONFIG = {
     "root_dir": "./filtered_dataset",
+    # dedup_dataset.py 결과 (없으면 폴더 전체 사용 + 랜덤 분리)
+    "manifest": "./filtered_dataset/dedup_manifest.csv",
     "models_root": "./models",
     "image_size": 224,
     "batch_size": 16,
     "epochs": 30,
     "val_split": 0.2,
+    # 실제 검증 비율이 val_split 에서 이만큼 넘게 벗어나면 중단
+    "val_tolerance": 0.05,
     "lr": 1e-4,
     "seed": 42
 }
@@ -38,6 +43,89 @@ def load_dataset(cat_dir):
 
     return files, labels, class_names
 
+def load_manifest(path):
+    # 카테고리 -> manifest 행 목록 (keep=0 포함, 경로는 실제 파일 경로로)
+    out = {}
+    root = Path(path).parent
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            row["file"] = str(root / row["path"])
+            out.setdefault(row["category"], []).append(row)
+    return out
+
+def check_manifest(cat_dir, rows):
+    # dedup 이후 추가/삭제된 이미지가 있으면 manifest 가 오래된 것
+    # (읽기 실패한 이미지도 status=unreadable 로 manifest 에 있으므로 여기서 걸리지 않음)
+    on_disk = {
+        str(fp.resolve())
+        for cls in cat_dir.iterdir() if cls.is_dir()
+        for fp in cls.iterdir() if fp.suffix.lower() in EXTS
+    }
+    listed = {str(Path(r["file"]).resolve()) for r in rows}
+    added = on_disk - listed
+    removed = listed - on_disk
+    if added or removed:
+        raise RuntimeError(
+            f"{cat_dir.name}: dedup manifest is stale "
+            f"({len(added)} new, {len(removed)} missing images), re-run dedup_dataset.py"
+        )
+    unreadable = sum(1 for r in rows if r.get("status") == "unreadable")
+    if unreadable:
+        print(f"  {cat_dir.name}: {unreadable} unreadable images excluded")
+
+def load_dataset_manifest(cat_dir, rows):
+    # 클래스 목록은 폴더 기준 (label_map 과 일치), 이미지는 keep=1 대표만
+    class_names = sorted([p.name for p in cat_dir.iterdir() if p.is_dir()])
+    cls_to_idx = {n: i for i, n in enumerate(class_names)}
+
+    kept = [r for r in rows if r["keep"] == "1"]
+    files = [r["file"] for r in kept]
+    labels = [cls_to_idx[r["label"]] for r in kept]
+    groups = [r["group"] for r in kept]
+    return files, labels, class_names, groups
+
+def group_split(labels, groups, val_split):
+    # 클래스별로 그룹 단위 분리: 비슷한 이미지(같은 그룹)는 학습/검증 중 한쪽에만
+    by_label = {}
+    for i, (lab, g) in enumerate(zip(labels, groups)):
+        by_label.setdefault(lab, {}).setdefault(g, []).append(i)
+
+    train_idx, val_idx = [], []
+    for lab in sorted(by_label):
+        by_group = by_label[lab]
+        keys = sorted(by_group)
+        random.shuffle(keys)
+
+        n = sum(len(v) for v in by_group.values())
+        target = round(n * val_split)
+        v = 0
+        for g in keys:
+            size = len(by_group[g])
+            # 목표 개수에 더 가까워질 때만 검증으로
+            if abs(v + size - target) < abs(v - target):
+                val_idx.extend(by_group[g])
+                v += size
+            else:
+                train_idx.extend(by_group[g])
+    return train_idx, val_idx
+
+def check_split(cat_name, labels, class_names, train_idx, val_idx, cfg):
+    for i, name in enumerate(class_names):
+        tr = sum(1 for j in train_idx if labels[j] == i)
+        va = sum(1 for j in val_idx if labels[j] == i)
+        print(f"  {cat_name}/{name}: train {tr}, val {va}")
+
+    total = len(train_idx) + len(val_idx)
+    frac = len(val_idx) / total if total else 0.0
+    print(f"  {cat_name}: train {len(train_idx)}, val {len(val_idx)} ({frac:.2f})")
+
+    # 클래스별 반올림 오차(클래스당 최대 0.5장)만큼은 허용
+    tol = cfg["val_tolerance"] + (0.5 * len(class_names) / total if total else 0.0)
+    if abs(frac - cfg["val_split"]) > tol:
+        raise ValueError(
+            f"{cat_name}: val fraction {frac:.2f} is far from val_split {cfg['val_split']}"
+        )
+
 def preprocess(path, label, img_size):
     img = tf.io.read_file(path)
     img = tf.io.decode_image(img, channels=3, expand_animations=False)
@@ -59,18 +147,25 @@ def build_model(num_classes, img_size):
     outputs = layers.Dense(num_classes, activation="softmax")(x)
     return keras.Model(inputs, outputs), base
 
-def train_category(cat_name, cfg):
+def train_category(cat_name, cfg, manifest=None):
     cat_dir = Path(cfg["root_dir"]) / cat_name
-    files, labels, class_names = load_dataset(cat_dir)
+    rows = manifest.get(cat_name) if manifest is not None else None
+
+    if rows:
+        check_manifest(cat_dir, rows)
+        files, labels, class_names, groups = load_dataset_manifest(cat_dir, rows)
+    else:
+        if manifest is not None:
+            print(f"  {cat_name}: not in dedup manifest, using all images")
+        files, labels, class_names = load_dataset(cat_dir)
+        groups = [str(i) for i in range(len(files))]
 
     if len(set(labels)) < 2:
+        print(f"  {cat_name}: skipped (fewer than 2 classes)")
         return None
 
-    idx = list(range(len(files)))
-    random.shuffle(idx)
-    split = int(len(idx) * cfg["val_split"])
-    val_idx = set(idx[:split])
-    train_idx = set(idx[split:])
+    train_idx, val_idx = group_split(labels, groups, cfg["val_split"])
+    check_split(cat_name, labels, class_names, train_idx, val_idx, cfg)
 
     def select(arr, idxset):
         return [arr[i] for i in idxset]
@@ -128,9 +223,20 @@ def main():
     root = Path(CONFIG["root_dir"])
     cats = sorted([d.name for d in root.iterdir() if d.is_dir()])
 
+    manifest = None
+    if Path(CONFIG["manifest"]).exists():
+        manifest = load_manifest(CONFIG["manifest"])
+
     registry = {}
+    failed = {}
     for c in cats:
-        info = train_category(c, CONFIG)
+        # manifest/split 검사 실패는 해당 카테고리만 건너뜀
+        try:
+            info = train_category(c, CONFIG, manifest)
+        except (RuntimeError, ValueError) as e:
+            print(f"  {c}: skipped ({e})")
+            failed[c] = str(e)
+            continue
         if info:
             registry[c] = info
 
@@ -138,5 +244,8 @@ def main():
     with open(out, "w", encoding="utf-8") as f:
         json.dump(registry, f, ensure_ascii=False, indent=2)
 
+    if failed:
+        print(f"skipped {len(failed)} categories: {', '.join(failed)}")
+
 if __name__ == "__main__":
     main()